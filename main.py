@@ -1,24 +1,39 @@
 #!/usr/bin/env python3
 import asyncio
-import json
-from dataclasses import dataclass
-from datetime import datetime
+import hashlib
+import os
+import random
+import re
+import shutil
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
 from enum import Enum
+from itertools import chain
+from operator import attrgetter
 from pathlib import Path
-from typing import List
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 import httpx
+import ijson
+import matplotlib
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
+import orjson
 from rich.console import Console
 from rich.table import Table
 from html import unescape
 
-@dataclass
+_TAG_RE = re.compile(r'<[^>]+>')
+_UTC = timezone.utc
+
+@dataclass(slots=True, frozen=True)
 class TrackerData:
     name: str
     date: datetime
     description: str
-    categories: List[str]
+    categories: Tuple[str, ...]
     url: str
     status: bool = True
 
@@ -26,79 +41,217 @@ class TrackerStatus(Enum):
     OPEN = "🟢 Open"
     CLOSED = "🔴 Closed"
 
-class WordPressAPI:
-    def __init__(self, base_url: str):
-        self._base_url = base_url
-        self._client = self._init_client()
+_STATUS_STR = {True: TrackerStatus.OPEN.value, False: TrackerStatus.CLOSED.value}
 
-    def _init_client(self) -> httpx.AsyncClient:
-        return httpx.AsyncClient(
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                "Accept": "application/json"
-            },
+_http_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30),
+            http2=True,
             timeout=30.0,
             follow_redirects=True
         )
+    return _http_client
+
+class DomainRateLimiter:
+    def __init__(self, min_delay: float = 0.5, max_delay: float = 1.0):
+        self._min_delay = min_delay
+        self._max_delay = max_delay
+        self._last_request: Dict[str, float] = {}
+
+    async def wait(self, host: str):
+        now = time.monotonic()
+        last = self._last_request.get(host)
+        start = now if last is None else max(now, last + random.uniform(self._min_delay, self._max_delay))
+        self._last_request[host] = start
+        await asyncio.sleep(start - now)
+
+_rate_limiter = DomainRateLimiter()
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_MAX_RETRY_DELAY = 30
+_MAX_REQUESTS_PER_HOST = 5
+_host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    host = httpx.URL(url).host
+    if host not in _host_semaphores:
+        _host_semaphores[host] = asyncio.Semaphore(_MAX_REQUESTS_PER_HOST)
+    return _host_semaphores[host]
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response]) -> float:
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), _MAX_RETRY_DELAY)
+    return min(2 ** attempt, _MAX_RETRY_DELAY) + random.uniform(0, 1)
+
+async def get_with_retry(client: httpx.AsyncClient, url: str, params: Optional[dict] = None,
+                         headers: Optional[dict] = None, max_attempts: int = 5,
+                         stream: bool = False) -> httpx.Response:
+    for attempt in range(max_attempts):
+        response = None
+        try:
+            async with _host_semaphore(url):
+                await _rate_limiter.wait(httpx.URL(url).host)
+                request = client.build_request("GET", url, params=params, headers=headers)
+                response = await client.send(request, stream=stream)
+            if response.status_code != 304:
+                response.raise_for_status()
+            return response
+        except (httpx.HTTPStatusError, httpx.TransportError) as e:
+            if response is not None and stream:
+                await response.aclose()
+            if isinstance(e, httpx.HTTPStatusError) and e.response.status_code not in _RETRY_STATUSES:
+                raise
+            if attempt == max_attempts - 1:
+                raise
+            await asyncio.sleep(_retry_delay(attempt, response))
+
+class _AsyncByteReader:
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks
+
+    async def read(self, size: int = -1) -> bytes:
+        if size == 0:
+            return b""
+        async for chunk in self._chunks:
+            if chunk:
+                return chunk
+        return b""
+
+class HttpCache:
+    _CACHED_HEADERS = ('X-WP-Total', 'X-WP-TotalPages')
+
+    def __init__(self, storage_path: Path):
+        self._storage = storage_path
+        self._storage.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, url: str) -> Path:
+        return self._storage / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json"
+
+    def _load(self, url: str) -> Optional[dict]:
+        path = self._path(url)
+        if not path.exists():
+            return None
+        return orjson.loads(path.read_bytes())
+
+    def conditional_headers(self, url: str) -> dict:
+        entry = self._load(url)
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def resolve(self, url: str, response: httpx.Response) -> Tuple[str, httpx.Headers]:
+        if response.status_code == 304:
+            entry = self._load(url)
+            if entry is None:
+                raise ValueError(f"Got 304 Not Modified for {url} but no cached response")
+            return entry['body'], httpx.Headers(entry.get('headers', {}))
+        entry = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'headers': {
+                name: response.headers[name]
+                for name in self._CACHED_HEADERS
+                if name in response.headers
+            },
+            'body': response.text
+        }
+        if entry['etag'] or entry['last_modified']:
+            self._path(url).write_bytes(orjson.dumps(entry))
+        return entry['body'], httpx.Headers(entry['headers'])
+
+def parse_wp_post(post: dict) -> TrackerData:
+    title = unescape(post['title']['rendered'])
+    status = "is Open for Limited Signup!" in title
+    name = title.replace(' is Open for Limited Signup!', '').strip()
+    description = unescape(_TAG_RE.sub('', post['excerpt']['rendered'])).strip()
+    categories = tuple(
+        term['name']
+        for term in post['_embedded']['wp:term'][0]
+        if term['taxonomy'] == 'category'
+    )
+    date = datetime.fromisoformat(post.get('date_gmt', post['date']).replace('Z', '+00:00'))
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=_UTC)
+    return TrackerData(
+        name=name,
+        date=date,
+        description=description,
+        categories=categories,
+        url=post['link'],
+        status=status
+    )
+
+class WordPressAPI:
+    _HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+        "Accept": "application/json"
+    }
+
+    def __init__(self, base_url: str, client: httpx.AsyncClient, cache: HttpCache):
+        self._base_url = base_url
+        self._client = client
+        self._cache = cache
 
     async def fetch_posts(self) -> List[TrackerData]:
         try:
             api_url = f"{self._base_url}/wp-json/wp/v2/posts"
             params = {"tags": "93", "per_page": 100, "_embed": "true"}
-            response = await self._client.get(api_url, params=params)
-            response.raise_for_status()
-            return [self._parse_post(post) for post in response.json()]
+            posts, total_pages = await self._fetch_page(api_url, params)
+            page_numbers = range(2, total_pages + 1)
+            pages = await asyncio.gather(*(
+                self._fetch_page(api_url, {**params, "page": page})
+                for page in page_numbers
+            ), return_exceptions=True)
+            for page, result in zip(page_numbers, pages):
+                if isinstance(result, BaseException):
+                    print(f"WordPress API Error on page {page}: {result}")
+                    continue
+                posts.extend(result[0])
+            return [parse_wp_post(post) for post in posts]
         except Exception as e:
             print(f"WordPress API Error: {e}")
             return []
 
-    def _parse_post(self, post: dict) -> TrackerData:
-        title = unescape(post['title']['rendered'])
-        status = "is Open for Limited Signup!" in title
-        name = title.replace(' is Open for Limited Signup!', '').strip()
-        description = unescape(post['excerpt']['rendered'])
-        description = description.replace('<p>', '').replace('</p>', '').strip()
-        categories = [
-            term['name']
-            for term in post['_embedded']['wp:term'][0]
-            if term['taxonomy'] == 'category'
-        ]
-        return TrackerData(
-            name=name,
-            date=datetime.fromisoformat(post['date'].replace('Z', '+00:00')),
-            description=description,
-            categories=categories,
-            url=post['link'],
-            status=status
-        )
-
-    async def close(self):
-        await self._client.aclose()
+    async def _fetch_page(self, api_url: str, params: dict) -> Tuple[List[dict], int]:
+        cache_key = str(httpx.URL(api_url, params=params))
+        headers = {**self._HEADERS, **self._cache.conditional_headers(cache_key)}
+        response = await get_with_retry(self._client, api_url, params, headers)
+        body, response_headers = self._cache.resolve(cache_key, response)
+        return orjson.loads(body), int(response_headers.get('X-WP-TotalPages', 1))
 
 class RedditAPI:
-    def __init__(self, subreddit: str = "OpenSignup"):
+    _HEADERS = {
+        "User-Agent": "Mozilla/5.0 (compatible; TrackerMonitorBot/1.0; +https://example.com/bot)"
+    }
+
+    def __init__(self, client: httpx.AsyncClient, subreddit: str = "OpenSignup"):
         self._subreddit = subreddit
         self._base_url = f"https://www.reddit.com/r/{subreddit}"
-        self._client = self._init_client()
-
-    def _init_client(self) -> httpx.AsyncClient:
-        return httpx.AsyncClient(
-            headers={
-                "User-Agent": "Mozilla/5.0 (compatible; TrackerMonitorBot/1.0; +https://example.com/bot)"
-            },
-            timeout=30.0,
-            follow_redirects=True
-        )
+        self._client = client
 
     async def fetch_posts(self) -> List[TrackerData]:
         try:
             api_url = f"{self._base_url}.json"
             params = {"limit": 100}
-            response = await self._client.get(api_url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            posts = data.get("data", {}).get("children", [])
-            return [self._parse_post(post["data"]) for post in posts]
+            response = await get_with_retry(self._client, api_url, params, self._HEADERS, stream=True)
+            try:
+                reader = _AsyncByteReader(response.aiter_bytes())
+                return [
+                    self._parse_post(post)
+                    async for post in ijson.items_async(reader, "data.children.item.data", use_float=True)
+                ]
+            finally:
+                await response.aclose()
         except Exception as e:
             print(f"Reddit API Error: {e}")
             return []
@@ -108,9 +261,9 @@ class RedditAPI:
         status = "is Open for Limited Signup!" in title
         name = title.replace(' is Open for Limited Signup!', '').strip() or post.get("id", "No Title")
         description = unescape(post.get("selftext", "")).strip()
-        categories = []
+        categories = ()
         created = post.get("created_utc", None)
-        date = datetime.utcfromtimestamp(created) if created else datetime.utcnow()
+        date = datetime.fromtimestamp(created, tz=_UTC) if created else datetime.now(_UTC)
         url = post.get("url", self._base_url)
         return TrackerData(
             name=name,
@@ -121,13 +274,12 @@ class RedditAPI:
             status=status
         )
 
-    async def close(self):
-        await self._client.aclose()
-
 class DataManager:
-    def __init__(self, storage_path: Path):
+    def __init__(self, storage_path: Path, cache_path: Path):
         self._storage = storage_path
         self._storage.mkdir(exist_ok=True)
+        self._cache = cache_path
+        self._cache.mkdir(parents=True, exist_ok=True)
 
     async def save(self, trackers: List[TrackerData]):
         data = {
@@ -135,105 +287,140 @@ class DataManager:
             'trackers': [self._serialize_tracker(t) for t in trackers]
         }
         current_date = datetime.now().strftime('%Y-%m-%d')
-        for file in [self._storage / f'trackers_{current_date}.json', self._storage / 'latest.json']:
-            with open(file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
+        await asyncio.to_thread(self._write_snapshot, data, current_date)
+
+    def _write_snapshot(self, data: dict, current_date: str):
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        dated_path = self._storage / f'trackers_{current_date}.json'
+        latest_path = self._storage / 'latest.json'
+        dated_path.write_bytes(payload)
+        latest_path.unlink(missing_ok=True)
+        try:
+            os.link(dated_path, latest_path)
+        except OSError:
+            shutil.copyfile(dated_path, latest_path)
 
     def _serialize_tracker(self, tracker: TrackerData) -> dict:
-        return {**{k: v for k, v in vars(tracker).items() if k != 'date'}, 'date': tracker.date.isoformat()}
+        data = asdict(tracker)
+        data['date'] = data.pop('date').isoformat()
+        return data
 
-    def create_visualizations(self, trackers: List[TrackerData]):
-        if not trackers:
-            print("No data to visualize")
-            return
-        category_stats = {}
-        for tracker in trackers:
-            for category in tracker.categories:
-                category_stats[category] = category_stats.get(category, 0) + 1
+    async def create_visualizations(self, category_stats: Counter):
         if category_stats:
-            plt.figure(figsize=(12,6))
-            plt.bar(category_stats.keys(), category_stats.values())
-            plt.xticks(rotation=45, ha='right')
-            plt.title('Category Distribution')
-            plt.tight_layout()
-            plt.savefig(self._storage / 'category_distribution.png', dpi=300, bbox_inches='tight')
-            plt.close()
-            plt.figure(figsize=(10,10))
-            plt.pie(category_stats.values(), labels=category_stats.keys(), autopct='%1.1f%%')
-            plt.title('Category Percentage')
-            plt.savefig(self._storage / 'category_percentage.png', dpi=300, bbox_inches='tight')
-            plt.close()
+            await asyncio.to_thread(self._render_plots, category_stats)
         else:
             print("No category data available for visualization.")
 
+    def _render_plots(self, category_stats: Counter):
+        items = sorted(category_stats.items())
+        labels = [category for category, _ in items]
+        counts = [count for _, count in items]
+        stats_hash = hashlib.blake2b(orjson.dumps(items)).hexdigest()
+        hash_path = self._cache / 'plots.hash'
+        distribution_path = self._storage / 'category_distribution.png'
+        percentage_path = self._storage / 'category_percentage.png'
+        if (hash_path.exists() and hash_path.read_text() == stats_hash
+                and distribution_path.exists() and percentage_path.exists()):
+            return
+        plt.figure(figsize=(12,6))
+        plt.bar(labels, counts)
+        plt.xticks(rotation=45, ha='right')
+        plt.title('Category Distribution')
+        plt.tight_layout()
+        plt.savefig(distribution_path, dpi=150, bbox_inches='tight')
+        plt.close()
+        plt.figure(figsize=(10,10))
+        plt.pie(counts, labels=labels, autopct='%1.1f%%')
+        plt.title('Category Percentage')
+        plt.savefig(percentage_path, dpi=150, bbox_inches='tight')
+        plt.close()
+        hash_path.write_text(stats_hash)
+
+_REPORT_HEADER = """# Tracker Status Report
+> Last Updated: {updated}
+
+## Statistics
+- Total Active Trackers: {total_trackers}
+- Total Categories: {total_categories}
+
+## Category Distribution
+![Distribution](./category_distribution.png)
+![Percentage](./category_percentage.png)
+
+## Active Trackers
+| Tracker | Categories | Open Date | Status |
+|---------|------------|-----------|--------|
+"""
+_REPORT_ROW = "| {} | {} | {} | {} |\n"
+
 class TrackerMonitor:
     def __init__(self):
-        self._wp_api = WordPressAPI("https://opentrackers.org")
-        self._reddit_api = RedditAPI("OpenSignup")
         self._data_dir = Path("data")
+        self._cache_dir = Path(".cache")
+        self._client = get_http_client()
+        self._wp_api = WordPressAPI("https://opentrackers.org", self._client, HttpCache(self._cache_dir / 'http'))
+        self._reddit_api = RedditAPI(self._client, "OpenSignup")
         self._console = Console()
-        self._data_manager = DataManager(self._data_dir)
+        self._data_manager = DataManager(self._data_dir, self._cache_dir)
 
     async def run(self):
         try:
-            wordpress_trackers = await self._wp_api.fetch_posts()
-            reddit_trackers = await self._reddit_api.fetch_posts()
+            results = await asyncio.gather(
+                self._wp_api.fetch_posts(),
+                self._reddit_api.fetch_posts(),
+                return_exceptions=True
+            )
+            wordpress_trackers, reddit_trackers = (
+                [] if isinstance(result, BaseException) else result
+                for result in results
+            )
             trackers = wordpress_trackers + reddit_trackers
             if not trackers:
                 self._console.print("[yellow]No trackers found[/yellow]")
                 return
-            await self._data_manager.save(trackers)
-            self._data_manager.create_visualizations(trackers)
-            self._display_results(trackers)
-            await self._create_markdown_report(trackers)
+            trackers.sort(key=attrgetter('date'), reverse=True)
+            category_stats = Counter(chain.from_iterable(t.categories for t in trackers))
+            await asyncio.gather(
+                self._data_manager.save(trackers),
+                self._data_manager.create_visualizations(category_stats)
+            )
+            rows = self._format_rows(trackers)
+            self._display_results(rows)
+            await self._create_markdown_report(rows, category_stats)
         except Exception as e:
             print(f"Error in main run: {e}")
         finally:
-            await self._wp_api.close()
-            await self._reddit_api.close()
+            await self._client.aclose()
 
-    def _display_results(self, trackers: List[TrackerData]):
+    def _format_rows(self, trackers: List[TrackerData]) -> List[Tuple[str, str, str, str]]:
+        return [
+            (
+                tracker.name,
+                ', '.join(tracker.categories) or '-',
+                tracker.date.strftime('%Y-%m-%d'),
+                _STATUS_STR[tracker.status]
+            )
+            for tracker in trackers
+        ]
+
+    def _display_results(self, rows: List[Tuple[str, str, str, str]]):
         table = Table(show_header=True, header_style="bold magenta")
         table.add_column("Tracker", style="cyan")
         table.add_column("Categories", style="green")
         table.add_column("Date", style="yellow")
         table.add_column("Status", style="bold")
-        for tracker in sorted(trackers, key=lambda x: x.date, reverse=True):
-            table.add_row(
-                tracker.name,
-                ', '.join(tracker.categories) if tracker.categories else '-',
-                tracker.date.strftime('%Y-%m-%d'),
-                TrackerStatus.OPEN.value if tracker.status else TrackerStatus.CLOSED.value
-            )
+        for row in rows:
+            table.add_row(*row)
         self._console.print(table)
 
-    async def _create_markdown_report(self, trackers: List[TrackerData]):
-        category_stats = {}
-        for tracker in trackers:
-            for category in tracker.categories:
-                category_stats[category] = category_stats.get(category, 0) + 1
-        markdown = f"""# Tracker Status Report
-> Last Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-## Statistics
-- Total Active Trackers: {len(trackers)}
-- Total Categories: {len(category_stats)}
-
-## Category Distribution
-![Distribution](./category_distribution.png)
-![Percentage](./category_percentage.png)
-
-## Active Trackers
-| Tracker | Categories | Open Date | Status |
-|---------|------------|-----------|--------|
-"""
-        for tracker in sorted(trackers, key=lambda x: x.date, reverse=True):
-            line = f"| {tracker.name} | {', '.join(tracker.categories) if tracker.categories else '-'} | {tracker.date.strftime('%Y-%m-%d')} | "
-            line += TrackerStatus.OPEN.value if tracker.status else TrackerStatus.CLOSED.value
-            line += " |\n"
-            markdown += line
-        with open(self._data_dir / 'README.md', 'w', encoding='utf-8') as f:
-            f.write(markdown)
+    async def _create_markdown_report(self, rows: List[Tuple[str, str, str, str]], category_stats: Counter):
+        header = _REPORT_HEADER.format(
+            updated=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            total_trackers=len(rows),
+            total_categories=len(category_stats)
+        )
+        markdown = header + ''.join(_REPORT_ROW.format(*row) for row in rows)
+        await asyncio.to_thread((self._data_dir / 'README.md').write_text, markdown, encoding='utf-8')
 
 if __name__ == "__main__":
     asyncio.run(TrackerMonitor().run())
\ No newline at end of file